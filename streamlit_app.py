@@ -1,5 +1,9 @@
 
+from functools import lru_cache
+
+import altair as alt
 import streamlit as st
+import numpy as np
 import pandas as pd
 
 st.set_page_config(page_title="Simulador de Partnership", layout="wide")
@@ -19,20 +23,30 @@ Ferramenta para colaboradores e sócios:
 # Função utilitária ###########################################################
 ###############################################################################
 
+_PT_BR_SEPARATORS = str.maketrans(",.", ".,")
+
+
+@lru_cache(maxsize=1024)
+def fmt_brl(x: float) -> str:
+    """Formata valor em reais no padrão pt-BR (R$ 1.234,56)."""
+    return f"R$ {x:,.2f}".translate(_PT_BR_SEPARATORS)
+
+
 def two_stage_valuation(fcf1: float, g1: float, years1: int, g2: float, wacc: float):
     """Enterprise Value (EV) por DCF em dois estágios (mid-year)."""
-    fcfs, pv_fcfs = [], []
-    for n in range(1, years1 + 1):
-        fcf_n = fcf1 * (1 + g1) ** (n - 1)
-        pv_n = fcf_n / (1 + wacc) ** (n - 0.5)
-        fcfs.append(fcf_n)
-        pv_fcfs.append(pv_n)
+    if wacc <= g2:  # guarda defensiva: a app não chama com WACC <= g∞ (Gordon indefinido)
+        return 0.0, np.zeros(years1), np.zeros(years1), 0.0
+
+    n = np.arange(1, years1 + 1)
+    fcfs = fcf1 * (1 + g1) ** (n - 1)
+    disc = np.power(1 + wacc, n - 0.5)  # fatores de desconto (mid-year)
+    pv_fcfs = fcfs / disc
 
     fcf_last = fcfs[-1] * (1 + g1)
     tv = fcf_last * (1 + g2) / (wacc - g2)
-    pv_tv = tv / (1 + wacc) ** (years1 - 0.5)
+    pv_tv = tv / disc[-1]  # mesmo fator do último ano (t = years1 - 0.5)
 
-    ev = sum(pv_fcfs) + pv_tv
+    ev = pv_fcfs.sum() + pv_tv
     return ev, fcfs, pv_fcfs, pv_tv
 
 ###############################################################################
@@ -61,34 +75,38 @@ with st.sidebar:
 ###############################################################################
 
 st.subheader("Sua participação hoje")
-col1, col2, col3 = st.columns(3)
-col1.metric("Valor da participação", f"R$ {share_value:,.2f}")
-col2.metric("Preço acordado", f"R$ {agreed_price:,.2f}")
-col3.metric("Saldo a pagar", f"R$ {balance_due:,.2f}")
+share_df = pd.DataFrame(
+    [[share_value, agreed_price, balance_due]],
+    columns=["Valor da participação", "Preço acordado", "Saldo a pagar"],
+)
+st.dataframe(share_df.style.format(fmt_brl), hide_index=True, width="stretch")
 
 ###############################################################################
 # Seção 2 – Valuation futuro ##################################################
 ###############################################################################
-ev, fcfs, pv_fcfs, pv_tv = two_stage_valuation(
-    fcf1,
-    g1_pct / 100,
-    years1,
-    g2_pct / 100,
-    wacc_pct / 100,
-)
-
-c1, c2 = st.columns(2)
-c1.metric("Enterprise Value (EV)", f"R$ {ev:,.2f}")
-c2.metric("Valor terminal (PV)", f"R$ {pv_tv:,.2f}")
-
-proj_df = pd.DataFrame({
-    "Ano (t)": list(range(1, years1 + 1)),  # inteiro garante ordem correta
-    "FCL projetado": fcfs,
-    "VP (mid-year)": pv_fcfs,
-})
-proj_df.set_index("Ano (t)", inplace=True)
-
-st.dataframe(proj_df, use_container_width=True)
+if wacc_pct <= g2_pct:  # só a projeção depende de WACC; gráfico e rodapé seguem
+    st.warning("WACC deve ser maior que o crescimento na perpetuidade (g∞).")
+else:
+    ev, fcfs, pv_fcfs, pv_tv = two_stage_valuation(
+        fcf1,
+        g1_pct / 100,
+        years1,
+        g2_pct / 100,
+        wacc_pct / 100,
+    )
+
+    ev_df = pd.DataFrame(
+        [[ev, pv_tv]],
+        columns=["Enterprise Value (EV)", "Valor terminal (PV)"],
+    )
+    st.dataframe(ev_df.style.format(fmt_brl), hide_index=True, width="stretch")
+
+    proj_df = pd.DataFrame(
+        {"FCL projetado": fcfs, "VP (mid-year)": pv_fcfs},
+        index=pd.RangeIndex(1, years1 + 1, name="Ano (t)"),  # inteiro garante ordem correta
+    )
+
+    st.dataframe(proj_df, width="stretch")
 
 ###############################################################################
 # Seção 3 – Gráfico ordenado ##################################################
@@ -96,17 +114,22 @@ st.dataframe(proj_df, use_container_width=True)
 
 # Série de valuations futuros (ilustrativa)
 future_years = years1 + 5  # +5 anos após estágio alto
-val_list = []
-ev_temp = valuation_input
-for n in range(1, future_years + 1):
-    growth = g1_pct if n <= years1 else g2_pct
-    ev_temp *= 1 + growth / 100
-    val_list.append({"Ano": n, "Valuation": ev_temp})
-
-chart_df = pd.DataFrame(val_list).set_index("Ano")
+n = np.arange(1, future_years + 1)
+rates = np.where(n <= years1, g1_pct, g2_pct) / 100
+valuation = valuation_input * np.cumprod(1.0 + rates)
+
+chart = (
+    alt.Chart(pd.DataFrame({"Ano": n, "Valuation": valuation}))
+    .mark_line()
+    .encode(
+        x=alt.X("Ano:O"),  # anos inteiros: eixo ordinal evita marcas fracionárias
+        y=alt.Y("Valuation:Q"),
+        tooltip=["Ano", alt.Tooltip("Valuation", format=",.2f")],
+    )
+)
 
 st.subheader("Valuation projetado (ilustrativo)")
-st.line_chart(chart_df.sort_index())
+st.altair_chart(chart, width="stretch")
 
 ###############################################################################
 # Rodapé ######################################################################